@@ -1,282 +1,760 @@
 import sys
+import atexit
 from youtube_transcript_api import YouTubeTranscriptApi
 from typing import Optional, List, Dict, Generator
 import re
 import json
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 import os
+import shutil
+from pathlib import PurePath
+import gzip
+import io
+import sqlite3
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import threading
+from functools import lru_cache
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import parse_qs, urlparse
+try:
+    import orjson  # optional C JSON codec for the index files; falls back to json
+except ImportError:
+    orjson = None
+try:
+    import zstandard  # optional; preferred codec for compressed transcripts (gzip otherwise)
+except ImportError:
+    zstandard = None
+try:
+    from yt_dlp import YoutubeDL  # optional; reads whole playlists (all pages) as structured data
+except ImportError:
+    YoutubeDL = None
+try:
+    import fcntl  # POSIX only; index files are then also locked against other processes
+except ImportError:
+    fcntl = None
+
+HTTP_TIMEOUT = (3.05, 10)  # seconds (connect, read); an unreachable host fails fast, slow bodies still get time
+HTTP_RETRY_ATTEMPTS = 3
+HTTP_RETRY_BASE_DELAY = 1.0  # seconds; doubled on each retry
+HTTP_RETRY_MAX_DELAY = 30.0  # seconds
+HTTP_RETRY_STATUSES = {429, 500, 502, 503, 504}
+MIN_RATE_LIMIT_PER_MINUTE = 1  # floor when 429s shrink the token bucket
+RATE_RECOVERY_SUCCESSES = 20  # successful requests after a slowdown before the rate is raised again
+RATE_RECOVERY_STEP_PER_MINUTE = 5  # additive increase per recovery step, up to rate_limit_per_minute
+OEMBED_MEMO_TTL = 3600  # seconds; in-process oEmbed memo
+OEMBED_WORKERS = 8  # background oEmbed lookups overlapped with transcript downloads
+OEMBED_MEMO_SIZE = 1024  # entries kept in the in-process oEmbed memo (LRU)
+# Freshness of on-disk cache entries by kind, in seconds
+CACHE_TTLS = {
+    'transcript': 7 * 24 * 3600,
+    'oembed': 24 * 3600,
+    'playlist_info': 3600,
+    'playlist_videos': 3600,
+}
+STREAM_CHUNK_SIZE = 8192  # bytes
+PLAYLIST_CHUNK_SIZE = 65536  # bytes
+WRITE_BUFFER_SIZE = 1 << 16  # bytes; transcript file buffer, so long transcripts reach the OS in large blocks
+ZSTD_LEVEL = 3  # fast level; transcripts still shrink several-fold
+INDEX_FLUSH_EVERY = 25  # playlist videos between flushes of the queued index updates
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; YouTubeTranscriptFetcher)',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# Pre-compiled regex patterns (hot paths run these once per transcript line / URL)
+# Single alternation so each transcript line is matched once: [Speaker]: / (Speaker): / <Speaker>: / Speaker:
+# (named groups br/pa/an/pl hold the label, rest the spoken text)
+_SPEAKER_RE = re.compile(r'^(?:\[(?P<br>[^\]]+)\]|\((?P<pa>[^)]+)\)|<(?P<an>[^>]+)>|(?P<pl>[^:\[\(<][^:]*)):(?P<rest>.+)$')
+_SPEAKER_PREFIX_CHARS = '[(<'
+_SPEAKER_COLON_WINDOW = 40  # plain "Speaker:" labels must have their colon within this many chars
+_VIDEO_ID_CHARS = frozenset('0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_-')
+# Canonical watch URL prefixes: the id starts right after the first '=', and no earlier
+# position can satisfy the regex below, so slicing there is equivalent to the search
+_WATCH_URL_PREFIXES = tuple(
+    f"{scheme}://{host}/watch?v="
+    for scheme in ('https', 'http')
+    for host in ('www.youtube.com', 'youtube.com', 'm.youtube.com')
+)
+_VIDEO_ID_PATTERNS = [
+    re.compile(r'(?:v=|\/)([0-9A-Za-z_-]{11}).*'),
+    re.compile(r'^([0-9A-Za-z_-]{11})$')
+]
+_FNAME_INVALID = re.compile(r'[<>:"/\\|?*]')
+_FNAME_INVALID_BYTES = b'<>:"/\\|?*'  # same set, for bytes.translate on ASCII titles
+_TITLE_RE = re.compile(r'<title>([^<]+)</title>')
+_PLAYLIST_VID_RE = re.compile(r'watch\?v=([a-zA-Z0-9_-]{11})')
+_YT_INITIAL_DATA_RE = re.compile(r'ytInitialData\s*=\s*')
+
+@lru_cache(maxsize=8192)
+def _fmt_ts(seconds: int) -> str:
+    """Format whole seconds as HH:MM:SS (memoized; adjacent entries often share a second)."""
+    hours, rem = divmod(seconds, 3600)
+    minutes, seconds = divmod(rem, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 class YouTubeTranscriptFetcher:
-    def __init__(self, rate_limit_per_minute: int = 60):
+    def __init__(self, rate_limit_per_minute: int = 60, cache_path: Optional[str] = None,
+                 cache_ttl: Optional[int] = None, compress_transcripts: bool = False):
+        """
+        Args:
+            rate_limit_per_minute: Maximum transcript requests per minute
+            cache_path: SQLite file for caching transcripts, oEmbed metadata and playlist
+                lookups across runs (disabled if None)
+            cache_ttl: Seconds a cached entry stays fresh; overrides the per-kind CACHE_TTLS if given
+            compress_transcripts: Store transcripts as .txt.zst (zstandard installed) or .txt.gz
+                instead of plain .txt; read them back with read_transcript()
+        """
         self.rate_limit = rate_limit_per_minute
-        self.last_request_time = 0
-        self.speaker_patterns = [
-            r'^\[([^\]]+)\]:(.+)$',  # [Speaker]: Text
-            r'^([^:]+):(.+)$',        # Speaker: Text
-            r'^\(([^\)]+)\):(.+)$',   # (Speaker): Text
-            r'<([^>]+)>:(.+)$'        # <Speaker>: Text
-        ]
-    def update_root_transcripts_json(self, transcript_path: str, metadata: dict, base_dir: str = "transcripts") -> None:
+        self.compress_transcripts = compress_transcripts
+        # Token bucket for _rate_limit_wait, driven by the monotonic clock and shared by all workers.
+        # The bucket holds up to a minute's worth of tokens, so bursts (e.g. the head of a playlist)
+        # go out immediately while the average still respects rate_limit_per_minute.
+        self._refill_rate = rate_limit_per_minute / 60.0  # tokens per second
+        self._capacity = float(rate_limit_per_minute)
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()
+        # 429s inside the current back-off window are one congestion event and only halve the rate once;
+        # successes afterwards raise it again additively (_record_success)
+        self._backoff_until = 0.0
+        self._successes = 0
+        # Index JSON updates are queued per file and written in batches by flush_indexes()
+        self._pending_index_updates: Dict[str, list] = {}
+        self._index_lock = threading.Lock()  # guards _pending_index_updates and _index_locks
+        # index path -> lock serializing its read-modify-write within this process
+        self._index_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        atexit.register(self.flush_indexes)  # unregistered by close(), which flushes itself
+        # video_id -> (expires_at, oEmbed JSON), LRU-bounded; only successful lookups are kept
+        self._oembed_memo: "OrderedDict[str, tuple]" = OrderedDict()
+        self._oembed_memo_lock = threading.Lock()
+        # Runs each video's oEmbed lookup while its transcript downloads
+        self._oembed_executor = ThreadPoolExecutor(max_workers=OEMBED_WORKERS, thread_name_prefix='oembed')
+        # playlist_id -> yt-dlp result ({'title', 'video_ids'}, or None on failure), so info and videos share one call
+        self._ytdlp_playlists: Dict[str, Optional[Dict]] = {}
+        # Directories already created by _ensure_dir, so playlist runs skip repeat mkdir syscalls
+        self._mkdir_cache = set()
+        # base_dir -> main transcripts dir, resolved once per output folder by _transcripts_root
+        self._root_dirs: Dict[str, str] = {}
+        # base_dir -> {video_id: transcript path}, scanned once per folder by _find_saved_transcript
+        self._saved_transcripts: Dict[str, Dict[str, str]] = {}
+        # One pooled session so repeated oEmbed/playlist hits reuse the keep-alive connection
+        self._session = requests.Session()
+        self._session.headers.update(DEFAULT_HEADERS)
+        self._session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=32, pool_block=False))
+        # Optional persistent cache so re-runs skip the network for videos already fetched
+        self.cache_ttl = cache_ttl
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        if cache_path:
+            cache_dir = os.path.dirname(cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            self._cache = sqlite3.connect(cache_path, check_same_thread=False)
+            self._cache.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+            self._cache.commit()
+
+    def close(self) -> None:
+        """
+        Flush queued index updates, then close the HTTP session and cache.
+        Also drops the atexit hook, which would otherwise keep the fetcher alive until exit.
         """
-        Update the JSON file that tracks transcripts in the root directory.
+        self.flush_indexes()
+        atexit.unregister(self.flush_indexes)
+        self._oembed_executor.shutdown(wait=True)
+        self._session.close()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    def _cache_get(self, kind: str, ident: str):
+        """Return the cached JSON value for (kind, ident) if present and still fresh, else None."""
+        if self._cache is None:
+            return None
+        key = f"{kind}:{ident}"
+        ttl = self.cache_ttl if self.cache_ttl is not None else CACHE_TTLS[kind]
+        try:
+            with self._cache_lock:
+                row = self._cache.execute("SELECT value, ts FROM cache WHERE key = ?", (key,)).fetchone()
+            if row and time.time() - row[1] < ttl:
+                return json.loads(row[0])
+        except Exception as e:
+            print(f"Error reading cache entry {key}: {e}")
+        return None
+
+    def _cache_set(self, kind: str, ident: str, value) -> None:
+        """Store a JSON-serializable value under (kind, ident)."""
+        if self._cache is None:
+            return
+        key = f"{kind}:{ident}"
+        try:
+            with self._cache_lock:
+                self._cache.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), int(time.time()))
+                )
+                self._cache.commit()
+        except Exception as e:
+            print(f"Error writing cache entry {key}: {e}")
+
+    def update_root_transcripts_json(self, transcript_path: str, metadata: dict, base_dir: str = "transcripts",
+                                     now_str: Optional[str] = None, rel_path: Optional[str] = None) -> None:
+        """
+        Queue an update of the JSON file that tracks transcripts in the root directory.
+        The file is written by the next flush_indexes().
         
         Args:
             transcript_path: Path to the transcript file
             metadata: Video and channel metadata
             base_dir: Base directory for transcripts
+            now_str: Pre-formatted 'date_added' timestamp; formatted here if omitted
+            rel_path: transcript_path relative to base_dir, if the caller already knows it
         """
         root_json_path = os.path.join(base_dir, "root_transcripts.json")
         
-        try:
-            # Load existing root JSON if it exists
-            if os.path.exists(root_json_path):
-                with open(root_json_path, 'r', encoding='utf-8') as f:
-                    root_data = json.load(f)
-            else:
-                root_data = {
-                    'last_updated': '',
-                    'total_transcripts': 0,
-                    'channels': {}
-                }
-            
-            channel_name = metadata['channel']['channel_name']
-            
-            # Initialize channel if it doesn't exist
-            if channel_name not in root_data['channels']:
-                root_data['channels'][channel_name] = {
-                    'channel_id': metadata['channel']['channel_id'],
-                    'channel_url': metadata['channel']['channel_url'],
-                    'videos': []
-                }
-            
-            # Add video information
-            video_info = {
-                'title': metadata['title'],
-                'video_id': metadata['video_id'],
-                'url': metadata['url'],
-                'transcript_path': os.path.relpath(transcript_path, base_dir),
-                'date_added': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Add video information
+        video_info = {
+            'title': metadata['title'],
+            'video_id': metadata['video_id'],
+            'url': metadata['url'],
+            'transcript_path': rel_path or os.path.relpath(transcript_path, base_dir),
+            'date_added': now_str or self._now_str()
+        }
+        self._queue_index_update(root_json_path, self._apply_root_transcripts_entry, metadata['channel'], video_info)
+
+    def _apply_root_transcripts_entry(self, root_data: dict, channel_info: dict, video_info: dict) -> None:
+        """Add one video to a loaded root_transcripts.json structure."""
+        channel_name = channel_info['channel_name']
+        
+        # Initialize channel if it doesn't exist
+        if channel_name not in root_data['channels']:
+            root_data['channels'][channel_name] = {
+                'channel_id': channel_info['channel_id'],
+                'channel_url': channel_info['channel_url'],
+                'videos': {}
             }
-            
-            # Check if video already exists (avoid duplicates)
-            video_ids = [v['video_id'] for v in root_data['channels'][channel_name]['videos']]
-            if video_info['video_id'] not in video_ids:
-                root_data['channels'][channel_name]['videos'].append(video_info)
-            
-            # Update metadata
-            root_data['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            root_data['total_transcripts'] = sum(
-                len(channel_data['videos'])
-                for channel_data in root_data['channels'].values()
-            )
-            
-            # Save updated root JSON
-            with open(root_json_path, 'w', encoding='utf-8') as f:
-                json.dump(root_data, f, indent=2)
-                
-        except Exception as e:
-            print(f"Error updating root transcripts JSON: {e}")
+        
+        # Add unless already indexed (avoid duplicates); videos are keyed by id, so this is O(1)
+        channel_videos = root_data['channels'][channel_name]['videos']
+        if video_info['video_id'] not in channel_videos:
+            channel_videos[video_info['video_id']] = video_info
+            root_data['total_transcripts'] += 1
 
+    def _load_index(self, index_path: str) -> dict:
+        """
+        Load a transcript index JSON file, or return an empty index if it does not exist.
+        Indexes written before videos were keyed by video_id store 'videos' as lists;
+        those are migrated to {video_id: info} dicts and the total is recounted once.
+        """
+        if not os.path.exists(index_path):
+            return {
+                'last_updated': '',
+                'total_transcripts': 0,
+                'channels': {}
+            }
+        
+        index_data = self._read_json(index_path)
+        
+        migrated = False
+        for channel_data in index_data['channels'].values():
+            containers = [channel_data] + list(channel_data.get('playlists', {}).values())
+            for container in containers:
+                if isinstance(container['videos'], list):
+                    videos = {}
+                    for video_info in container['videos']:
+                        videos.setdefault(video_info['video_id'], video_info)
+                    container['videos'] = videos
+                    migrated = True
+        
+        if migrated:
+            index_data['total_transcripts'] = sum(
+                len(channel_data['videos']) +
+                sum(len(playlist['videos']) for playlist in channel_data.get('playlists', {}).values())
+                for channel_data in index_data['channels'].values()
+            )
+        return index_data
 
-    def update_master_json(self, transcript_path: str, metadata: dict, base_dir: str = "transcripts") -> None:
+    def update_master_json(self, transcript_path: str, metadata: dict, base_dir: str = "transcripts",
+                           now_str: Optional[str] = None, rel_path: Optional[str] = None) -> None:
         """
-        Update the master JSON file with information about a new transcript.
+        Queue an update of the master JSON file with information about a new transcript.
+        The file is written by the next flush_indexes(). now_str is reused as 'date_added'
+        and rel_path (transcript_path relative to base_dir) skips the relpath walk when given.
         """
         master_json_path = os.path.join(base_dir, "master_transcript_index.json")
         
-        try:
-            # Load existing master JSON if it exists
-            if os.path.exists(master_json_path):
-                with open(master_json_path, 'r', encoding='utf-8') as f:
-                    master_data = json.load(f)
-            else:
-                master_data = {
-                    'last_updated': '',
-                    'total_transcripts': 0,
-                    'channels': {}
-                }
-            
-            channel_name = metadata['channel']['channel_name']
-            
-            # Get relative path from base_dir to transcript
+        # Get relative path from base_dir to transcript
+        if rel_path is None:
             rel_path = os.path.relpath(transcript_path, base_dir)
-            
-            # Initialize channel if it doesn't exist
-            if channel_name not in master_data['channels']:
-                master_data['channels'][channel_name] = {
-                    'channel_id': metadata['channel']['channel_id'],
-                    'channel_url': metadata['channel']['channel_url'],
-                    'playlists': {},
-                    'videos': []
-                }
-            
-            # Get playlist name from path if it exists
-            path_parts = rel_path.split(os.sep)
-            if len(path_parts) > 2:  # If in playlist subfolder
-                playlist_name = path_parts[1]
-                if playlist_name not in master_data['channels'][channel_name]['playlists']:
-                    master_data['channels'][channel_name]['playlists'][playlist_name] = {
-                        'videos': []
-                    }
-                
-                # Add video to playlist
-                video_info = {
-                    'title': metadata['title'],
-                    'video_id': metadata['video_id'],
-                    'url': metadata['url'],
-                    'transcript_path': rel_path,
-                    'date_added': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                master_data['channels'][channel_name]['playlists'][playlist_name]['videos'].append(video_info)
-            else:
-                # Add video to channel's direct videos list
-                video_info = {
-                    'title': metadata['title'],
-                    'video_id': metadata['video_id'],
-                    'url': metadata['url'],
-                    'transcript_path': rel_path,
-                    'date_added': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Get playlist name from path if it exists
+        path_parts = PurePath(rel_path).parts
+        playlist_name = path_parts[1] if len(path_parts) > 2 else None  # If in playlist subfolder
+        
+        video_info = {
+            'title': metadata['title'],
+            'video_id': metadata['video_id'],
+            'url': metadata['url'],
+            'transcript_path': rel_path,
+            'date_added': now_str or self._now_str()
+        }
+        self._queue_index_update(master_json_path, self._apply_master_entry, metadata['channel'], playlist_name, video_info)
+
+    def _apply_master_entry(self, master_data: dict, channel_info: dict, playlist_name: Optional[str],
+                            video_info: dict) -> None:
+        """Add one video to a loaded master index, under its playlist if it has one."""
+        channel_name = channel_info['channel_name']
+        
+        # Initialize channel if it doesn't exist
+        if channel_name not in master_data['channels']:
+            master_data['channels'][channel_name] = {
+                'channel_id': channel_info['channel_id'],
+                'channel_url': channel_info['channel_url'],
+                'playlists': {},
+                'videos': {}
+            }
+        
+        if playlist_name is not None:
+            # Add video to playlist
+            playlists = master_data['channels'][channel_name]['playlists']
+            if playlist_name not in playlists:
+                playlists[playlist_name] = {
+                    'videos': {}
                 }
-                master_data['channels'][channel_name]['videos'].append(video_info)
-            
-            # Update master data metadata
-            master_data['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            master_data['total_transcripts'] = sum(
-                len(channel_data['videos']) +
-                sum(len(playlist['videos']) for playlist in channel_data['playlists'].values())
-                for channel_data in master_data['channels'].values()
-            )
-            
-            # Save updated master JSON
-            with open(master_json_path, 'w', encoding='utf-8') as f:
-                json.dump(master_data, f, indent=2)
-            
-        except Exception as e:
-            print(f"Error updating master JSON: {e}")
+            videos = playlists[playlist_name]['videos']
+        else:
+            # Add video to channel's direct videos list
+            videos = master_data['channels'][channel_name]['videos']
+        
+        # Videos are keyed by id: O(1) duplicate check and a running total
+        if video_info['video_id'] not in videos:
+            videos[video_info['video_id']] = video_info
+            master_data['total_transcripts'] += 1
+
+    def _queue_index_update(self, index_path: str, apply_update, *args) -> None:
+        """Queue apply_update(index_data, *args) for index_path until the next flush_indexes()."""
+        with self._index_lock:
+            self._pending_index_updates.setdefault(index_path, []).append((apply_update, args))
+
+    def flush_indexes(self) -> None:
+        """
+        Write all queued index updates. Each index file is loaded once, every
+        queued entry is applied, and the result replaces the file atomically.
+        """
+        with self._index_lock:
+            pending, self._pending_index_updates = self._pending_index_updates, {}
+        if not pending:
+            return
+        
+        now_str = self._now_str()
+        for index_path, updates in pending.items():
+            try:
+                with self._locked_index(index_path):
+                    index_data = self._load_index(index_path)
+                    for apply_update, args in updates:
+                        apply_update(index_data, *args)
+                    index_data['last_updated'] = now_str
+                    self._write_json(index_path, index_data)
+            except Exception as e:
+                print(f"Error updating index {index_path}: {e}")
+
+    @contextmanager
+    def _locked_index(self, index_path: str):
+        """
+        Hold the exclusive lock for one index file around a load/mutate/write.
+        Threads share a per-path lock; other processes are kept out by an
+        flock on index_path + '.lock' where fcntl is available.
+        """
+        with self._index_lock:
+            path_lock = self._index_locks[index_path]
+        
+        with path_lock:
+            if fcntl is None:
+                yield
+                return
+            self._ensure_dir(os.path.dirname(index_path) or '.')
+            with open(index_path + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
 
     def update_root_folder_json(self, original_path: str, root_path: str, metadata: dict, channel_dir: str) -> None:
         """
-        Update the JSON file tracking transcripts in the root account folder.
+        Record a transcript in the root account folder's append-only log (root_transcripts.jsonl).
+        Each call appends one JSON line, so the cost does not grow with the history;
+        compact_root_json() folds the log into the structured root_transcripts.json.
         """
-        root_json_path = os.path.join(channel_dir, "root_transcripts.json")
+        log_path = os.path.join(channel_dir, "root_transcripts.jsonl")
         
         try:
-            # Load existing JSON if it exists
-            if os.path.exists(root_json_path):
-                with open(root_json_path, 'r', encoding='utf-8') as f:
-                    root_data = json.load(f)
-            else:
-                root_data = {
-                    'last_updated': '',
-                    'total_transcripts': 0,
-                    'videos': []
-                }
-            
-            # Add video information
             video_info = {
                 'title': metadata['title'],
                 'video_id': metadata['video_id'],
                 'url': metadata['url'],
                 'original_path': original_path,
                 'root_path': root_path,
-                'date_added': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'date_added': self._now_str()
             }
-            root_data['videos'].append(video_info)
-            
-            # Update metadata
-            root_data['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            root_data['total_transcripts'] = len(root_data['videos'])
-            
-            # Save updated JSON
-            with open(root_json_path, 'w', encoding='utf-8') as f:
-                json.dump(root_data, f, indent=2)
+            line = json.dumps(video_info, ensure_ascii=False) + '\n'
+            with self._locked_index(log_path):
+                with open(log_path, 'a', encoding='utf-8') as f:
+                    f.write(line)
             
         except Exception as e:
             print(f"Error updating root folder JSON: {e}")
 
-    def save_transcript_with_timestamps(self, video_url: str, base_dir: str = "transcripts") -> Optional[tuple]:
+    def compact_root_json(self, channel_dir: str) -> Optional[dict]:
+        """
+        Fold root_transcripts.jsonl into root_transcripts.json (the 'videos' list format)
+        and empty the log. total_transcripts is derived from the merged list.
+        Returns the compacted data, or None on error.
+        """
+        log_path = os.path.join(channel_dir, "root_transcripts.jsonl")
+        root_json_path = os.path.join(channel_dir, "root_transcripts.json")
+        
+        try:
+            with self._locked_index(log_path), self._locked_index(root_json_path):
+                if os.path.exists(root_json_path):
+                    root_data = self._read_json(root_json_path)
+                else:
+                    root_data = {
+                        'last_updated': '',
+                        'total_transcripts': 0,
+                        'videos': []
+                    }
+                
+                if os.path.exists(log_path):
+                    with open(log_path, 'r', encoding='utf-8') as f:
+                        root_data['videos'].extend(json.loads(line) for line in f if line.strip())
+                
+                root_data['last_updated'] = self._now_str()
+                root_data['total_transcripts'] = len(root_data['videos'])
+                self._write_json(root_json_path, root_data)
+                
+                # Only drop the log once its entries are safely in the snapshot
+                if os.path.exists(log_path):
+                    open(log_path, 'w').close()
+            return root_data
+            
+        except Exception as e:
+            print(f"Error compacting root folder JSON: {e}")
+            return None
+
+    def save_transcript_with_timestamps(self, video_url: str, base_dir: str = "transcripts",
+                                        force: bool = False) -> Optional[tuple]:
         """
         Save transcript with timestamps to both playlist location and root directory.
+        If base_dir already holds a transcript for the video, it is reused without any
+        network requests (metadata is read back from its header) unless force is True.
         Returns tuple of (filepath, metadata) if successful, None otherwise.
         """
         video_id = self._extract_video_id(video_url)
         if not video_id:
             return None
 
+        if not force:
+            existing_path = self._find_saved_transcript(base_dir, video_id)
+            if existing_path:
+                metadata = self._metadata_from_saved_transcript(existing_path, video_id)
+                if metadata:
+                    print(f"Transcript already saved: {existing_path}")
+                    return existing_path, metadata
+
+        # The oEmbed lookup has no dependency on the transcript, so overlap the two round-trips
+        oembed_future = self._oembed_executor.submit(self._fetch_oembed, video_id)
         transcript = self.get_transcript(video_url)
         if not transcript:
             return None
 
-        metadata = self._get_video_metadata(video_id, transcript)
+        metadata = self._video_metadata_from_oembed(video_id, oembed_future.result())
         
         # Create filename from video title (sanitized)
         safe_title = self._sanitize_filename(metadata['title'])
-        filename = f"{safe_title}_{video_id}.txt"
+        filename = f"{safe_title}_{video_id}{self._transcript_extension()}"
         
         # Setup paths for both playlist and root locations
         playlist_filepath = os.path.join(base_dir, filename)
-        root_dir = os.path.dirname(os.path.dirname(base_dir))  # Go up to main transcripts dir
+        root_dir = self._transcripts_root(base_dir)  # Go up to main transcripts dir
         root_filepath = os.path.join(root_dir, filename)
 
         # Create directories if needed
-        os.makedirs(base_dir, exist_ok=True)
-        os.makedirs(root_dir, exist_ok=True)
-
-        # Create transcript content
-        transcript_content = f"Title: {metadata['title']}\n"
-        transcript_content += f"Video URL: {metadata['url']}\n"
-        transcript_content += f"Channel Name: {metadata['channel']['channel_name']}\n"
-        transcript_content += f"Channel URL: {metadata['channel']['channel_url']}\n"
-        transcript_content += f"Channel ID: {metadata['channel']['channel_id']}\n"
-        transcript_content += f"Has Speaker Labels: {metadata['has_speaker_labels']}\n"
-        transcript_content += f"Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        transcript_content += "\n" + "="*50 + "\n\n"
-
-        for entry in transcript:
-            timestamp = self._format_timestamp(entry['start'])
-            speaker, text = self._extract_speaker_and_text(entry['text'])
-            
-            if speaker:
-                transcript_content += f"[{timestamp}] {speaker}: {text}\n"
-            else:
-                transcript_content += f"[{timestamp}] {text}\n"
+        self._ensure_dir(base_dir)
+        self._ensure_dir(root_dir)
+
+        # Most transcripts have no speaker labels; the (cheap) check over the whole transcript
+        # lets those skip speaker parsing entirely. Knowing the flag up front lets the
+        # header go out first and the body be streamed straight to the file.
+        has_speakers = self._check_for_speakers(transcript)
+        metadata['has_speaker_labels'] = has_speakers
+        now_str = self._now_str()  # one timestamp for the header and both index entries
 
-        # Save to playlist location
-        with open(playlist_filepath, 'w', encoding='utf-8') as f:
-            f.write(transcript_content)
+        header = (
+            f"Title: {metadata['title']}\n"
+            f"Video URL: {metadata['url']}\n"
+            f"Channel Name: {metadata['channel']['channel_name']}\n"
+            f"Channel URL: {metadata['channel']['channel_url']}\n"
+            f"Channel ID: {metadata['channel']['channel_id']}\n"
+            f"Has Speaker Labels: {metadata['has_speaker_labels']}\n"
+            f"Downloaded: {now_str}\n"
+            "\n"
+            f"{'=' * 50}\n"
+            "\n"
+        )
+
+        # Save to playlist location; lines are generated as they are written, never held all at once
+        self._write_transcript(playlist_filepath, header, self._transcript_lines(transcript, has_speakers))
+        self._saved_transcripts.get(base_dir, {})[video_id] = playlist_filepath
         print(f"Transcript saved to playlist folder: {playlist_filepath}")
 
-        # Save to root location
-        with open(root_filepath, 'w', encoding='utf-8') as f:
-            f.write(transcript_content)
+        # Save to root location as a hardlink of the same file; copy where links are unsupported
+        self._link_or_copy(playlist_filepath, root_filepath)
+        self._saved_transcripts.get(root_dir, {})[video_id] = root_filepath
         print(f"Transcript saved to root folder: {root_filepath}")
 
-        # Update tracking JSONs
-        self.update_master_json(playlist_filepath, metadata, base_dir=root_dir)
-        self.update_root_transcripts_json(root_filepath, metadata, base_dir=root_dir)
+        # Queue updates of the tracking JSONs (written by flush_indexes)
+        # Both relative paths are known without walking the tree: the root copy sits directly
+        # in root_dir, and the playlist copy is computed once here
+        self.update_master_json(playlist_filepath, metadata, base_dir=root_dir, now_str=now_str,
+                                rel_path=os.path.relpath(playlist_filepath, root_dir))
+        self.update_root_transcripts_json(root_filepath, metadata, base_dir=root_dir, now_str=now_str,
+                                          rel_path=filename)
         
         return playlist_filepath, metadata
 
+    def _read_json(self, path: str):
+        """Load a JSON file, with orjson when it is installed."""
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _find_saved_transcript(self, base_dir: str, video_id: str) -> Optional[str]:
+        """
+        Path of an existing '<title>_<video_id>' transcript in base_dir, or None.
+        The folder is listed once per fetcher, so a playlist run does not rescan it per video.
+        """
+        saved = self._saved_transcripts.get(base_dir)
+        if saved is None:
+            saved = {}
+            extension = self._transcript_extension()
+            try:
+                with os.scandir(base_dir) as entries:
+                    for entry in entries:
+                        stem = entry.name[:-len(extension)]
+                        if entry.name.endswith(extension) and stem[-12:-11] == '_' and entry.is_file():
+                            saved[stem[-11:]] = entry.path
+            except FileNotFoundError:
+                pass
+            self._saved_transcripts[base_dir] = saved
+        return saved.get(video_id)
+
+    def _metadata_from_saved_transcript(self, path: str, video_id: str) -> Optional[Dict]:
+        """
+        Rebuild the video metadata dict from a saved transcript's header.
+        Only the lines up to the '=====' separator are read (and decompressed).
+        Returns None if the file cannot be read, the header is incomplete, or it holds
+        the placeholders of a failed oEmbed lookup, so such videos are fetched again.
+        """
+        separator = f"{'=' * 50}\n"
+        fields = {}
+        try:
+            with self._open_transcript(path) as f:
+                for line in f:
+                    if line == separator:
+                        break
+                    key, sep, value = line.rstrip('\n').partition(': ')
+                    if sep:
+                        fields[key] = value
+        except Exception as e:
+            print(f"Error reading saved transcript {path}: {e}")
+            return None
+        
+        if fields.get('Title') == 'Unknown Title' or fields.get('Channel Name') == 'Unknown Channel':
+            return None
+        try:
+            return {
+                'title': fields['Title'],
+                'video_id': video_id,
+                'url': fields['Video URL'],
+                'has_speaker_labels': fields['Has Speaker Labels'] == 'True',
+                'channel': {
+                    'channel_name': fields['Channel Name'],
+                    'channel_id': None if fields['Channel ID'] == 'None' else fields['Channel ID'],
+                    'channel_url': None if fields['Channel URL'] == 'None' else fields['Channel URL']
+                }
+            }
+        except KeyError:
+            return None
+
+    def _transcript_extension(self) -> str:
+        """File extension for saved transcripts, reflecting the compression in use."""
+        if not self.compress_transcripts:
+            return '.txt'
+        return '.txt.zst' if zstandard is not None else '.txt.gz'
+
+    def _transcript_lines(self, transcript: List[Dict], has_speakers: bool) -> Generator[str, None, None]:
+        """Yield the formatted '[HH:MM:SS] ...' line (newline included) for each transcript entry."""
+        # Bind hot-loop callables to locals so each iteration avoids attribute lookups;
+        # the memoized module-level formatter is called directly, with no method frame per entry.
+        fmt_ts = _fmt_ts
+        if has_speakers:
+            extract_speaker = self._extract_speaker_and_text
+            for entry in transcript:
+                timestamp = fmt_ts(int(entry['start']))
+                speaker, text = extract_speaker(entry['text'])
+                
+                if speaker:
+                    yield f"[{timestamp}] {speaker}: {text}\n"
+                else:
+                    yield f"[{timestamp}] {text}\n"
+        else:
+            for entry in transcript:
+                yield f"[{fmt_ts(int(entry['start']))}] {entry['text'].strip()}\n"
+
+    def _write_transcript(self, path: str, header: str, lines) -> None:
+        """
+        Stream a transcript header and its lines to path, compressing according to the
+        file extension. Output goes through a WRITE_BUFFER_SIZE file buffer, so memory stays
+        at about one buffer and long transcripts need few write syscalls. Lines always end in '\n'.
+        """
+        if path.endswith('.zst'):
+            with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as raw, \
+                    zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw) as f:
+                f.write(header.encode('utf-8'))
+                for line in lines:
+                    f.write(line.encode('utf-8'))
+        elif path.endswith('.gz'):
+            with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as raw, \
+                    gzip.open(raw, 'wt', encoding='utf-8', newline='\n') as f:
+                f.write(header)
+                f.writelines(lines)
+        else:
+            with open(path, 'w', encoding='utf-8', newline='\n', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(header)
+                f.writelines(lines)
+
+    def read_transcript(self, path: str) -> str:
+        """Read a saved transcript (.txt, .txt.zst or .txt.gz) back as text."""
+        with self._open_transcript(path) as f:
+            return f.read()
+
+    def _open_transcript(self, path: str):
+        """
+        Open a saved transcript for reading as a UTF-8 text stream, decompressing on the fly.
+        .zst files are read through a stream reader: _write_transcript streams them, so their
+        frames carry no content size and cannot be decompressed in one shot.
+        """
+        if path.endswith('.zst'):
+            if zstandard is None:
+                raise RuntimeError(f"zstandard is required to read {path}")
+            reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+            return io.TextIOWrapper(reader, encoding='utf-8', newline='\n')
+        if path.endswith('.gz'):
+            return gzip.open(path, 'rt', encoding='utf-8', newline='\n')
+        return open(path, 'r', encoding='utf-8', newline='\n')
+
+    def _now_str(self) -> str:
+        """Current local time in the '%Y-%m-%d %H:%M:%S' format used throughout the transcripts and indexes."""
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def _write_json(self, path: str, data) -> None:
+        """
+        Serialize data in one shot and write it in one call.
+        orjson (when installed) produces indented UTF-8 bytes in C; otherwise json.dumps
+        without indent, which takes the C encoder fast path that indent=2 never uses.
+        The file is written to a temporary sibling and swapped in with os.replace,
+        so readers (and a crash mid-write) only ever see the old or the new content.
+        The data is fsynced first so the rename never exposes an empty file after a power loss.
+        """
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _link_or_copy(self, src: str, dst: str) -> None:
+        """
+        Make dst a hardlink of src, replacing any existing dst.
+        Falls back to a byte copy across devices or on filesystems without hardlinks.
+        """
+        if os.path.abspath(src) == os.path.abspath(dst):
+            return
+        try:
+            os.unlink(dst)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(src, dst)
+        except (OSError, NotImplementedError):
+            shutil.copyfile(src, dst)
+
+    def _transcripts_root(self, base_dir: str) -> str:
+        """
+        Main transcripts dir for a save folder: two levels up from transcripts/<channel>/<playlist>.
+        Never climbs past the first path component, so a shallow base_dir (e.g. the default
+        "transcripts") is its own root instead of resolving to an empty path.
+        """
+        root_dir = self._root_dirs.get(base_dir)
+        if root_dir is None:
+            parts = PurePath(base_dir).parts
+            root_dir = os.path.join(*parts[:max(1, len(parts) - 2)]) if parts else base_dir
+            self._root_dirs[base_dir] = root_dir
+        return root_dir
+
+    def _ensure_dir(self, path: str) -> None:
+        """Create a directory (and parents) once per fetcher; later calls are a set lookup."""
+        if path not in self._mkdir_cache:
+            os.makedirs(path, exist_ok=True)
+            self._mkdir_cache.add(path)
+
     def _sanitize_filename(self, name: str) -> str:
         """Convert a string into a valid filename/directory name."""
-        # Remove invalid chars
-        name = re.sub(r'[<>:"/\\|?*]', '', name)
-        # Replace spaces and multiple dashes with single dash
-        name = re.sub(r'[-\s]+', '-', name.strip())
-        return name
+        # Remove invalid chars; ASCII titles (the common case) take the C-level bytes.translate path
+        if name.isascii():
+            name = name.encode('ascii').translate(None, _FNAME_INVALID_BYTES).decode('ascii')
+        else:
+            name = _FNAME_INVALID.sub('', name)
+        name = name.strip()
+        # Replace spaces and multiple dashes with single dash: split on both, then join.
+        # A leading/trailing dash run survives as a single dash, as the old [-\s]+ -> '-' substitution did
+        sanitized = '-'.join(name.replace('-', ' ').split())
+        if name[:1] == '-' or name[-1:] == '-':
+            if not sanitized:
+                return '-'
+            if name[0] == '-':
+                sanitized = '-' + sanitized
+            if name[-1] == '-':
+                sanitized += '-'
+        return sanitized
 
     def _extract_video_id(self, url: str) -> Optional[str]:
         """Extract video ID from various forms of YouTube URLs."""
-        patterns = [
-            r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
-            r'^([0-9A-Za-z_-]{11})$'
-        ]
+        # Fast paths without the regex engine: a bare id, or a canonical watch URL
+        # (youtu.be links already match within the first few regex steps)
+        if len(url) == 11 and _VIDEO_ID_CHARS.issuperset(url):
+            return url
+        if url.startswith(_WATCH_URL_PREFIXES):
+            start = url.find('=') + 1
+            video_id = url[start:start + 11]
+            if len(video_id) == 11 and _VIDEO_ID_CHARS.issuperset(video_id):
+                return video_id
         
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _VIDEO_ID_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         return None
@@ -293,86 +771,264 @@ class YouTubeTranscriptFetcher:
         return None
 
     def _rate_limit_wait(self):
-        """Implement rate limiting to avoid overloading the API."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        wait_time = (60 / self.rate_limit) - time_since_last_request
+        """
+        Implement rate limiting to avoid overloading the API.
+        Thread-safe token bucket: each caller refills and takes a token under the
+        lock. If the bucket is empty the token is borrowed (the balance goes
+        negative) and the caller sleeps for the deficit outside the lock, so
+        concurrent workers queue up in order without holding each other up.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._refill_rate)
+            self._last_refill = now
+            self._tokens -= 1
+            wait_time = -self._tokens / self._refill_rate if self._tokens < 0 else 0
         
         if wait_time > 0:
             time.sleep(wait_time)
-        
-        self.last_request_time = time.time()
 
-    def _format_timestamp(self, seconds: float) -> str:
-        """Convert seconds to HH:MM:SS format."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        seconds = int(seconds % 60)
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    def _slow_down(self, backoff: float) -> None:
+        """
+        Halve the token bucket's refill rate (and its capacity) after the server answers 429.
+        Further 429s within the next backoff seconds (concurrent workers hitting the same
+        limit) are ignored, so one burst of 429s only halves the rate once.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            if now < self._backoff_until:
+                return
+            self._backoff_until = now + backoff
+            self._successes = 0
+            self._set_refill_rate(max(MIN_RATE_LIMIT_PER_MINUTE / 60.0, self._refill_rate / 2))
+            rate_per_minute = self._refill_rate * 60
+        print(f"Rate limited by YouTube; slowing down to {rate_per_minute:.1f} requests/minute")
+
+    def _record_success(self) -> None:
+        """
+        Count a successful request. After RATE_RECOVERY_SUCCESSES of them (outside a back-off
+        window) a slowed-down bucket gains RATE_RECOVERY_STEP_PER_MINUTE, up to rate_limit_per_minute.
+        """
+        with self._rate_lock:
+            if self._refill_rate * 60 >= self.rate_limit or time.monotonic() < self._backoff_until:
+                return
+            self._successes += 1
+            if self._successes < RATE_RECOVERY_SUCCESSES:
+                return
+            self._successes = 0
+            self._set_refill_rate(min(self.rate_limit / 60.0,
+                                      self._refill_rate + RATE_RECOVERY_STEP_PER_MINUTE / 60.0))
+
+    def _set_refill_rate(self, refill_rate: float) -> None:
+        """Set the bucket's refill rate (tokens per second) and its one-minute capacity; caller holds _rate_lock."""
+        self._refill_rate = refill_rate
+        self._capacity = max(1.0, refill_rate * 60)
+        self._tokens = min(self._tokens, self._capacity)
+
+    def _retry_after_seconds(self, response: requests.Response) -> Optional[float]:
+        """Parse a Retry-After header given either as seconds or as an HTTP date."""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _http_get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET through the pooled session, retrying connection errors, timeouts and
+        429/5xx responses with exponential backoff (up to HTTP_RETRY_ATTEMPTS).
+        A 429 also shrinks the shared token bucket and honours Retry-After;
+        successful responses let it recover.
+        The last response is returned as-is; the last connection error is raised.
+        """
+        kwargs.setdefault('timeout', HTTP_TIMEOUT)
+        for attempt in range(HTTP_RETRY_ATTEMPTS):
+            last_attempt = attempt == HTTP_RETRY_ATTEMPTS - 1
+            delay = min(HTTP_RETRY_MAX_DELAY, HTTP_RETRY_BASE_DELAY * 2 ** attempt)
+            try:
+                response = self._session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                print(f"Request to {url} failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            
+            if response.status_code < 400:
+                self._record_success()
+            if response.status_code not in HTTP_RETRY_STATUSES or last_attempt:
+                return response
+            
+            if response.status_code == 429:
+                retry_after = self._retry_after_seconds(response)
+                if retry_after is not None:
+                    delay = min(HTTP_RETRY_MAX_DELAY, max(delay, retry_after))
+                self._slow_down(delay)
+            response.close()
+            time.sleep(delay)
 
     def _extract_speaker_and_text(self, text: str) -> tuple:
         """
         Try to extract speaker and text from a transcript line.
         Returns tuple of (speaker, text). If no speaker found, returns (None, original_text)
         """
-        for pattern in self.speaker_patterns:
-            match = re.match(pattern, text.strip())
-            if match:
-                speaker, content = match.groups()
-                return speaker.strip(), content.strip()
+        text = text.strip()
+        # Cheap prefilter: most auto-generated lines have no label, so skip the regex for them
+        if text[:1] not in _SPEAKER_PREFIX_CHARS and ':' not in text[:_SPEAKER_COLON_WINDOW]:
+            return None, text
+        match = _SPEAKER_RE.match(text)
+        if match:
+            speaker = match.group('br') or match.group('pa') or match.group('an') or match.group('pl')
+            return speaker.strip(), match.group('rest').strip()
         
-        return None, text.strip()
+        return None, text
 
     def _check_for_speakers(self, transcript: List[Dict]) -> bool:
-        """Check if the transcript contains any speaker labels."""
-        for entry in transcript:
-            speaker, _ = self._extract_speaker_and_text(entry['text'])
-            if speaker:
-                return True
-        return False
+        """
+        Check if the transcript contains any speaker labels.
+        Every label format ends in ':', so a single substring scan over the joined text
+        rules out most auto-generated transcripts before any per-entry parsing.
+        """
+        if ':' not in ''.join([entry['text'] for entry in transcript]):
+            return False
+        return any(self._extract_speaker_and_text(entry['text'])[0] for entry in transcript)
+
+    def _fetch_oembed(self, video_id: str) -> Optional[Dict]:
+        """
+        Fetch the oEmbed JSON for a video. A single response carries both the
+        video title and the channel (author) fields.
+        Memoized in process (OEMBED_MEMO_SIZE entries, OEMBED_MEMO_TTL) and on disk when enabled.
+        Returns None if the request fails.
+        """
+        with self._oembed_memo_lock:
+            memo = self._oembed_memo.get(video_id)
+            if memo and memo[0] > time.monotonic():
+                self._oembed_memo.move_to_end(video_id)
+                return memo[1]
+        
+        data = self._cache_get('oembed', video_id)
+        if data is None:
+            try:
+                oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
+                response = self._http_get(oembed_url)
+                if response.status_code == 200:
+                    data = response.json()
+                    self._cache_set('oembed', video_id, data)
+            except Exception as e:
+                print(f"Error fetching oEmbed data for {video_id}: {e}")
+        
+        if data is not None:
+            with self._oembed_memo_lock:
+                self._oembed_memo[video_id] = (time.monotonic() + OEMBED_MEMO_TTL, data)
+                self._oembed_memo.move_to_end(video_id)
+                while len(self._oembed_memo) > OEMBED_MEMO_SIZE:
+                    self._oembed_memo.popitem(last=False)
+        return data
+
+    def _channel_info_from_oembed(self, data: Optional[Dict]) -> Dict:
+        """Build the channel dict from an oEmbed response; None gives the 'Unknown Channel' placeholder."""
+        if data is None:
+            return {
+                'channel_name': 'Unknown Channel',
+                'channel_id': None,
+                'channel_url': None
+            }
+        
+        # Extract channel URL from author_url if available
+        channel_url = data.get('author_url', '')
+        channel_id = channel_url.split('/')[-1] if channel_url else None
+        
+        return {
+            'channel_name': data.get('author_name', 'Unknown Channel'),
+            'channel_id': channel_id,
+            'channel_url': channel_url
+        }
 
     def _get_channel_info(self, video_id: str) -> Dict:
         """Get channel information from YouTube oEmbed API."""
+        return self._channel_info_from_oembed(self._fetch_oembed(video_id))
+
+    def _get_playlist_ytdlp(self, playlist_id: str) -> Optional[Dict]:
+        """
+        Read a playlist's title and every video id through yt-dlp's flat extraction.
+        Unlike the HTML scrape this follows pagination, so playlists past the first
+        page come back complete. Returns None if yt-dlp is not installed or fails.
+        """
+        if YoutubeDL is None:
+            return None
+        if playlist_id in self._ytdlp_playlists:
+            return self._ytdlp_playlists[playlist_id]
+        
+        result = None
         try:
-            oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-            response = requests.get(oembed_url)
-            if response.status_code == 200:
-                data = response.json()
-                # Extract channel URL from author_url if available
-                channel_url = data.get('author_url', '')
-                channel_id = channel_url.split('/')[-1] if channel_url else None
-                
-                return {
-                    'channel_name': data.get('author_name', 'Unknown Channel'),
-                    'channel_id': channel_id,
-                    'channel_url': channel_url
-                }
+            self._rate_limit_wait()
+            options = {'extract_flat': 'in_playlist', 'quiet': True, 'skip_download': True}
+            with YoutubeDL(options) as ydl:
+                info = ydl.extract_info(f"https://www.youtube.com/playlist?list={playlist_id}", download=False)
+            entries = info.get('entries') or []
+            result = {
+                'title': info.get('title'),
+                'video_ids': list(dict.fromkeys(entry['id'] for entry in entries if entry and entry.get('id')))
+            }
         except Exception as e:
-            print(f"Error fetching channel info: {e}")
+            print(f"Error reading playlist with yt-dlp: {e}")
         
-        return {
-            'channel_name': 'Unknown Channel',
-            'channel_id': None,
-            'channel_url': None
-        }
+        self._ytdlp_playlists[playlist_id] = result
+        return result
 
     def _get_playlist_info(self, playlist_id: str) -> Dict:
-        """Get playlist metadata using YouTube's oEmbed API."""
+        """
+        Get playlist metadata (cached on disk when enabled).
+        Uses yt-dlp when installed, otherwise reads the playlist page title.
+        """
+        cached = self._cache_get('playlist_info', playlist_id)
+        if cached is not None:
+            return cached
+        
+        ytdlp = self._get_playlist_ytdlp(playlist_id)
+        if ytdlp and ytdlp['title']:
+            playlist_info = {
+                'playlist_id': playlist_id,
+                'title': ytdlp['title'],
+                'url': f"https://www.youtube.com/playlist?list={playlist_id}"
+            }
+            self._cache_set('playlist_info', playlist_id, playlist_info)
+            return playlist_info
+        
         try:
             # Get first video from playlist to get channel info
             playlist_url = f"https://www.youtube.com/playlist?list={playlist_id}"
-            response = requests.get(playlist_url)
-            
-            if response.status_code == 200:
-                # Extract playlist title from HTML (basic extraction)
-                title_match = re.search(r'<title>([^<]+)</title>', response.text)
-                playlist_title = title_match.group(1).replace('- YouTube', '').strip() if title_match else 'Unknown Playlist'
-                
-                return {
-                    'playlist_id': playlist_id,
-                    'title': playlist_title,
-                    'url': playlist_url
-                }
+            with self._http_get(playlist_url, stream=True) as response:
+                if response.status_code == 200:
+                    # <title> sits in the first few KB, so stop reading as soon as it is found.
+                    # Only a small tail is carried between chunks in case the tag straddles a boundary.
+                    response.encoding = 'utf-8'
+                    buffer = ''
+                    title_match = None
+                    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=True):
+                        buffer += chunk
+                        title_match = _TITLE_RE.search(buffer)
+                        if title_match:
+                            break
+                        buffer = buffer[-STREAM_CHUNK_SIZE:]
+                    
+                    # Extract playlist title from HTML (basic extraction)
+                    playlist_title = title_match.group(1).replace('- YouTube', '').strip() if title_match else 'Unknown Playlist'
+                    
+                    playlist_info = {
+                        'playlist_id': playlist_id,
+                        'title': playlist_title,
+                        'url': playlist_url
+                    }
+                    if title_match:
+                        self._cache_set('playlist_info', playlist_id, playlist_info)
+                    return playlist_info
         except Exception as e:
             print(f"Error fetching playlist info: {e}")
         
@@ -384,59 +1040,103 @@ class YouTubeTranscriptFetcher:
 
     def _get_playlist_videos(self, playlist_id: str) -> Generator[str, None, None]:
         """
-        Get video IDs from a playlist using requests and basic HTML parsing.
-        This is a simple implementation - for production, consider using youtube-dl or an official API.
+        Get video IDs from a playlist, in playlist order.
+        With yt-dlp installed the full (paginated) playlist is read through it.
+        Otherwise reads the ytInitialData JSON embedded in the playlist page; if that
+        cannot be found or parsed, falls back to scraping watch?v= links. The HTML
+        path only sees the first page of a long playlist.
+        The id list is cached on disk when caching is enabled.
         """
+        cached = self._cache_get('playlist_videos', playlist_id)
+        if cached:
+            yield from cached
+            return
+        
+        ytdlp = self._get_playlist_ytdlp(playlist_id)
+        if ytdlp and ytdlp['video_ids']:
+            self._cache_set('playlist_videos', playlist_id, ytdlp['video_ids'])
+            yield from ytdlp['video_ids']
+            return
+        
         try:
             playlist_url = f"https://www.youtube.com/playlist?list={playlist_id}"
-            response = requests.get(playlist_url)
-            
-            if response.status_code == 200:
-                # Basic regex to find video IDs
-                video_ids = re.findall(r'watch\?v=([a-zA-Z0-9_-]{11})', response.text)
-                seen = set()
-                
-                for video_id in video_ids:
-                    if video_id not in seen:
-                        seen.add(video_id)
-                        yield video_id
+            with self._http_get(playlist_url, stream=True) as response:
+                if response.status_code == 200:
+                    # YouTube always serves UTF-8; setting it skips charset detection
+                    # and lets iter_content decode incrementally
+                    response.encoding = 'utf-8'
+                    html = ''.join(response.iter_content(chunk_size=PLAYLIST_CHUNK_SIZE, decode_unicode=True))
+                    
+                    video_ids = self._parse_initial_data_video_ids(html)
+                    if not video_ids:
+                        # Basic regex to find video IDs; these links also pick up
+                        # thumbnails and related videos, so the ids are deduplicated
+                        # (dict.fromkeys keeps first-seen order)
+                        video_ids = list(dict.fromkeys(_PLAYLIST_VID_RE.findall(html)))
+                    
+                    if video_ids:
+                        self._cache_set('playlist_videos', playlist_id, video_ids)
+                    yield from video_ids
                         
         except Exception as e:
             print(f"Error fetching playlist videos: {e}")
 
-    def _get_video_metadata(self, video_id: str, transcript: List[Dict]) -> Dict:
+    def _parse_initial_data_video_ids(self, html: str) -> List[str]:
         """
-        Get basic video metadata using oEmbed and check for speaker labels.
+        Extract playlist video IDs from the ytInitialData JSON block of a playlist page.
+        Returns an empty list if the block is missing or has an unexpected shape.
         """
+        match = _YT_INITIAL_DATA_RE.search(html)
+        if not match:
+            return []
+        
         try:
-            oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-            response = requests.get(oembed_url)
-            
-            if response.status_code == 200:
-                data = response.json()
-                channel_info = self._get_channel_info(video_id)
-                
-                return {
-                    'title': data.get('title', 'Unknown Title'),
-                    'video_id': video_id,
-                    'url': f'https://www.youtube.com/watch?v={video_id}',
-                    'has_speaker_labels': self._check_for_speakers(transcript),
-                    'channel': channel_info
-                }
-        except Exception as e:
-            print(f"Error fetching metadata: {e}")
+            data, _ = json.JSONDecoder().raw_decode(html, match.end())
+        except ValueError:
+            return []
+        
+        renderer = self._find_json_key(data, 'playlistVideoListRenderer')
+        if not isinstance(renderer, dict):
+            return []
+        
+        video_ids = (item.get('playlistVideoRenderer', {}).get('videoId') for item in renderer.get('contents', []))
+        return list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+
+    def _find_json_key(self, obj, key: str):
+        """Depth-first search of nested dicts/lists for the first value stored under key."""
+        if isinstance(obj, dict):
+            if key in obj:
+                return obj[key]
+            children = obj.values()
+        elif isinstance(obj, list):
+            children = obj
+        else:
+            return None
         
+        for child in children:
+            found = self._find_json_key(child, key)
+            if found is not None:
+                return found
+        return None
+
+    def _video_metadata_from_oembed(self, video_id: str, data: Optional[Dict]) -> Dict:
+        """
+        Build the video metadata dict from an already fetched oEmbed response (None if it failed).
+        One response provides both the title and the channel. 'has_speaker_labels' is left
+        as None; the save path fills it in before writing the transcript.
+        """
         return {
-            'title': 'Unknown Title',
+            'title': data.get('title', 'Unknown Title') if data is not None else 'Unknown Title',
             'video_id': video_id,
             'url': f'https://www.youtube.com/watch?v={video_id}',
-            'has_speaker_labels': self._check_for_speakers(transcript),
-            'channel': self._get_channel_info(video_id)
+            'has_speaker_labels': None,
+            'channel': self._channel_info_from_oembed(data)
         }
 
     def get_transcript(self, video_url: str) -> Optional[List[Dict]]:
         """
         Fetch transcript for a given YouTube video URL.
+        Served from the on-disk cache when a fresh entry exists.
         Returns None if transcript is unavailable.
         """
         try:
@@ -445,17 +1145,28 @@ class YouTubeTranscriptFetcher:
                 print(f"Error: Could not extract video ID from URL: {video_url}")
                 return None
 
+            transcript = self._cache_get('transcript', video_id)
+            if transcript is not None:
+                return transcript
+
             self._rate_limit_wait()
             transcript = YouTubeTranscriptApi.get_transcript(video_id)
+            self._record_success()
+            if transcript:
+                self._cache_set('transcript', video_id, transcript)
             return transcript
 
         except Exception as e:
             print(f"Error fetching transcript for {video_url}: {str(e)}")
             return None
 
-    def save_playlist_transcripts(self, playlist_url: str, base_dir: str = "transcripts") -> List[str]:
+    def save_playlist_transcripts(self, playlist_url: str, base_dir: str = "transcripts",
+                                  max_workers: int = 8, force: bool = False) -> List[str]:
         """
         Save transcripts for all videos in a playlist.
+        Videos are downloaded concurrently by up to max_workers threads; the
+        shared rate limiter still caps the overall request rate.
+        Videos already saved in the playlist folder are skipped unless force is True.
         Returns list of saved file paths.
         """
         playlist_id = self._extract_playlist_id(playlist_url)
@@ -466,20 +1177,20 @@ class YouTubeTranscriptFetcher:
         playlist_info = self._get_playlist_info(playlist_id)
         saved_files = []
         
-        # Get first video to determine channel info
-        first_video_id = next(self._get_playlist_videos(playlist_id), None)
-        if not first_video_id:
+        # Materialize the video list once so the playlist page is only fetched a single time
+        video_ids = list(self._get_playlist_videos(playlist_id))
+        if not video_ids:
             print("Error: Could not find any videos in playlist")
             return []
 
         # Get channel info from first video
-        channel_info = self._get_channel_info(first_video_id)
+        channel_info = self._get_channel_info(video_ids[0])
         
         # Create directory structure
         channel_name = self._sanitize_filename(channel_info['channel_name'])
         playlist_name = self._sanitize_filename(playlist_info['title'])
         playlist_dir = os.path.join(base_dir, channel_name, playlist_name)
-        os.makedirs(playlist_dir, exist_ok=True)
+        self._ensure_dir(playlist_dir)
 
         # Initialize playlist metadata
         playlist_metadata = {
@@ -492,59 +1203,123 @@ class YouTubeTranscriptFetcher:
             'videos': []
         }
         
-        # Process each video in the playlist
-        for video_id in self._get_playlist_videos(playlist_id):
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            try:
-                result = self.save_transcript_with_timestamps(
-                    video_url, 
-                    base_dir=playlist_dir
-                )
-                if result:
-                    filepath, metadata = result
-                    saved_files.append(filepath)
-                    playlist_metadata['videos'].append(metadata)
-                    print(f"Processed video: {video_id}")
-                else:
-                    print(f"Failed to process video: {video_id}")
-                
-                # Update playlist metadata file
-                metadata_file = os.path.join(playlist_dir, "playlist_metadata.json")
-                with open(metadata_file, 'w', encoding='utf-8') as f:
-                    json.dump(playlist_metadata, f, indent=2)
+        # Process videos concurrently; get_transcript() goes through the shared rate limiter.
+        # Videos finish in any order, so results are slotted by playlist position and only
+        # the finished in-order prefix is moved into saved_files / playlist_metadata.
+        metadata_file = os.path.join(playlist_dir, "playlist_metadata.json")
+        results: List[Optional[tuple]] = [None] * len(video_ids)
+        finished = [False] * len(video_ids)
+        next_index = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.save_transcript_with_timestamps,
+                    f"https://www.youtube.com/watch?v={video_id}",
+                    base_dir=playlist_dir,
+                    force=force
+                ): index
+                for index, video_id in enumerate(video_ids)
+            }
+            
+            for completed, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+                video_id = video_ids[index]
+                try:
+                    results[index] = future.result()
+                    if results[index]:
+                        print(f"Processed video: {video_id}")
+                    else:
+                        print(f"Failed to process video: {video_id}")
+                except Exception as e:
+                    print(f"Error processing video {video_id}: {e}")
+                finished[index] = True
                 
-                # Respect rate limit
-                self._rate_limit_wait()
+                while next_index < len(video_ids) and finished[next_index]:
+                    if results[next_index]:
+                        filepath, metadata = results[next_index]
+                        saved_files.append(filepath)
+                        playlist_metadata['videos'].append(metadata)
+                    next_index += 1
                 
-            except Exception as e:
-                print(f"Error processing video {video_id}: {e}")
-                continue
+                # Persist progress in batches rather than rewriting every file per video
+                if completed % INDEX_FLUSH_EVERY == 0:
+                    self._write_json(metadata_file, playlist_metadata)
+                    self.flush_indexes()
 
+        # Update playlist metadata file and indexes with the final batch
+        self._write_json(metadata_file, playlist_metadata)
+        self.flush_indexes()
         return saved_files
 
+    def save_many(self, video_urls: List[str], base_dir: str = "transcripts", max_workers: int = 8,
+                  force: bool = False) -> List[str]:
+        """
+        Save transcripts for several videos concurrently.
+        Up to max_workers videos are in flight at once; the shared rate limiter still
+        caps the overall request rate. Duplicate URLs are only fetched once, and videos
+        already saved in base_dir are skipped unless force is True.
+        Returns list of saved file paths, in the order of video_urls.
+        """
+        unique_urls = list(dict.fromkeys(video_urls))
+        saved_by_index: Dict[int, str] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.save_transcript_with_timestamps, video_url, base_dir=base_dir,
+                                force=force): index
+                for index, video_url in enumerate(unique_urls)
+            }
+            
+            for future in as_completed(futures):
+                index = futures[future]
+                video_url = unique_urls[index]
+                try:
+                    result = future.result()
+                    if result:
+                        saved_by_index[index] = result[0]
+                        print(f"Processed video: {video_url}")
+                    else:
+                        print(f"Failed to process video: {video_url}")
+                except Exception as e:
+                    print(f"Error processing video {video_url}: {e}")
+
+        self.flush_indexes()
+        return [saved_by_index[index] for index in sorted(saved_by_index)]
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python script.py <youtube_url>")
+    if len(sys.argv) < 2:
+        print("Usage: python script.py <youtube_url> [<youtube_url> ...]")
         print("Supported URLs:")
         print("  - Single video: https://www.youtube.com/watch?v=VIDEO_ID")
         print("  - Playlist: https://www.youtube.com/playlist?list=PLAYLIST_ID")
         return
 
-    url = sys.argv[1]
-    fetcher = YouTubeTranscriptFetcher(rate_limit_per_minute=30)
+    urls = sys.argv[1:]
+    fetcher = YouTubeTranscriptFetcher(
+        rate_limit_per_minute=30,
+        cache_path=os.path.join("transcripts", ".cache.sqlite")
+    )
 
-    if 'playlist' in url:
-        saved_files = fetcher.save_playlist_transcripts(url)
-        if saved_files:
-            print(f"\nSuccessfully saved {len(saved_files)} transcripts!")
-        else:
-            print("\nNo transcripts were saved.")
-    else:
-        filepath = fetcher.save_transcript_with_timestamps(url)
-        if filepath:
-            print("Transcript saved successfully!")
-        else:
-            print("Failed to save transcript.")
+    try:
+        playlist_urls = [url for url in urls if 'playlist' in url]
+        video_urls = [url for url in urls if 'playlist' not in url]
+        for url in playlist_urls:
+            saved_files = fetcher.save_playlist_transcripts(url)
+            if saved_files:
+                print(f"\nSuccessfully saved {len(saved_files)} transcripts!")
+            else:
+                print("\nNo transcripts were saved.")
+        if len(video_urls) == 1:
+            filepath = fetcher.save_transcript_with_timestamps(video_urls[0])
+            if filepath:
+                print("Transcript saved successfully!")
+            else:
+                print("Failed to save transcript.")
+        elif video_urls:
+            # Several videos: fetch them concurrently under the shared rate limit
+            saved_files = fetcher.save_many(video_urls)
+            print(f"\nSuccessfully saved {len(saved_files)} of {len(set(video_urls))} transcripts!")
+    finally:
+        fetcher.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file